@@ -6,13 +6,16 @@
 - 改进日志输出，更易于调试
 - 添加更多浏览器特征模拟
 """
+import re
 import time
 import random
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 import requests
+import urllib3
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from dataclasses import dataclass
 
 # 导入存储模块的数据类
@@ -21,6 +24,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.storage import BidInfo
 
+# 部分站点证书不规范，请求时 verify=False，进程内只需关闭一次告警
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 
 # User-Agent 池 - 保持最新的浏览器版本
 USER_AGENTS = [
@@ -31,6 +37,9 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 ]
 
+# 非页面链接 (脚本、锚点、邮件、电话)，不区分大小写，匹配时无需先复制出小写字符串
+NON_PAGE_HREF = re.compile(r'(?:javascript:|#|mailto:|tel:)', re.IGNORECASE)
+
 
 class BaseCrawler(ABC):
     """爬虫基类"""
@@ -77,9 +86,6 @@ class BaseCrawler(ABC):
         Returns:
             页面HTML内容，失败返回None
         """
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
         for attempt in range(self.max_retries):
             try:
                 self.logger.debug(f"正在请求: {url} (尝试 {attempt + 1}/{self.max_retries})")
@@ -132,6 +138,35 @@ class BaseCrawler(ABC):
         """解析HTML内容"""
         return BeautifulSoup(html, 'lxml')
     
+    def iter_links(self, html: str) -> Iterator[Tuple[str, str]]:
+        """
+        遍历页面中所有带 href 的链接
+        
+        直接使用 lxml 遍历文档树，不为每个节点创建 BeautifulSoup 对象，
+        链接文本与 get_text(strip=True) 的结果一致。
+        
+        Args:
+            html: 页面HTML内容
+            
+        Returns:
+            (href, 链接文本) 迭代器
+        """
+        try:
+            root = lxml_html.fromstring(html)
+        except etree.ParserError:
+            # 空文档
+            return
+        except ValueError:
+            # 带编码声明的文本 lxml 无法直接解析，回退到 BeautifulSoup
+            for a in self.parse_html(html).find_all('a', href=True):
+                yield a['href'], a.get_text(strip=True)
+            return
+        
+        for a in root.iter('a'):
+            href = a.get('href')
+            if href is not None:
+                yield href, ''.join(s.strip() for s in a.itertext())
+    
     @abstractmethod
     def parse(self, html: str) -> List[BidInfo]:
         """
@@ -3,18 +3,64 @@
 """
 from typing import List
 from urllib.parse import urljoin, urlparse, parse_qs
-from datetime import datetime
-from .base import BaseCrawler, BidInfo
+from datetime import datetime, date
+from .base import BaseCrawler, BidInfo, NON_PAGE_HREF
+from .selenium_crawler import SharedBrowserManager, SELENIUM_AVAILABLE, IMPORT_ERROR_MSG
 
 import requests
+from bs4 import BeautifulSoup
 import json
 import re
 import random
+import threading
+import time
+from requests.adapters import HTTPAdapter
+
+if SELENIUM_AVAILABLE:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from webdriver_manager.chrome import ChromeDriverManager
+
+
+# 河北省招标网 selectype 参数 -> API端点
+_HEBEI_ENDPOINT_MAP = {
+    'zbgg': 'zbgg.do',      # 招标公告
+    'bggg': 'bggg.do',      # 变更公告
+    'dygs': 'dygs.do',      # 答疑公示
+    'kbjl': 'kbjl.do',      # 开标记录
+    'pbgs': 'pbgs.do',      # 中标候选人公示
+    'zhongbgg': 'zhongbgg.do',  # 中标结果公示
+    'qylx': 'qylx.do',      # 签约履行
+    'zbpro': 'zbpro.do',    # 招标计划公告
+}
+
+# 河北省招标网API端点 -> 返回JSON中的数据键名
+_HEBEI_ENDPOINT_TO_KEY = {
+    'zbgg.do': 'search_ZbGg',
+    'bggg.do': 'search_BgGg',
+    'dygs.do': 'search_DyGs',
+    'kbjl.do': 'search_KbJl',
+    'pbgs.do': 'search_PbGs',
+    'zhongbgg.do': 'search_ZhongbGg',
+    'qylx.do': 'search_QyLx',
+    'zbpro.do': 'search_ZbPro',
+}
+
+# 响应是否为JSON对象 (跳过前导空白，无需复制整个响应)
+_JSON_OBJECT_START = re.compile(r'\s*\{')
 
 
 class CustomCrawler(BaseCrawler):
     """自定义通用爬虫"""
     
+    # 河北省招标网各端点共用的会话
+    _hebei_session = None
+    _hebei_session_lock = threading.Lock()
+    
     def __init__(self, config: dict, name: str, url: str):
         self._name = name  # 必须在 super().__init__() 之前设置，因为父类会访问 self.name
         self.url = url
@@ -24,25 +70,33 @@ class CustomCrawler(BaseCrawler):
         
         # 如果是河北省招标网，解析selectype参数确定API端点
         self._hebei_api_endpoint = None
+        # 最近一次API响应 (原文, 已解析的JSON)，供parse直接复用
+        self._hebei_json_cache = None
         if self._is_hebei_api:
             parsed = urlparse(url)
             params = parse_qs(parsed.query)
             selectype = params.get('selectype', ['zbgg'])[0]
             # 根据selectype确定API端点
-            endpoint_map = {
-                'zbgg': 'zbgg.do',      # 招标公告
-                'bggg': 'bggg.do',      # 变更公告
-                'dygs': 'dygs.do',      # 答疑公示
-                'kbjl': 'kbjl.do',      # 开标记录
-                'pbgs': 'pbgs.do',      # 中标候选人公示
-                'zhongbgg': 'zhongbgg.do',  # 中标结果公示
-                'qylx': 'qylx.do',      # 签约履行
-                'zbpro': 'zbpro.do',    # 招标计划公告
-            }
-            self._hebei_api_endpoint = endpoint_map.get(selectype, 'zbgg.do')
+            self._hebei_api_endpoint = _HEBEI_ENDPOINT_MAP.get(selectype, 'zbgg.do')
         
         super().__init__(config)
         
+        # 河北省招标网的多个端点位于同一主机，共用会话以复用已建立的连接和TLS会话
+        if self._is_hebei_api:
+            self.session = self._get_hebei_session()
+    
+    @classmethod
+    def _get_hebei_session(cls) -> requests.Session:
+        """获取河北省招标网共用的会话"""
+        with cls._hebei_session_lock:
+            if cls._hebei_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                cls._hebei_session = session
+            return cls._hebei_session
+        
     @property
     def name(self) -> str:
         return self._name
@@ -66,9 +120,6 @@ class CustomCrawler(BaseCrawler):
     
     def _fetch_hebei_api(self) -> str:
         """通过API获取河北省招标网数据"""
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
         # 构造API URL
         base_url = 'https://szj.hebei.gov.cn/zbtbfwpt/tender/xxgk/'
         api_url = base_url + self._hebei_api_endpoint
@@ -108,14 +159,13 @@ class CustomCrawler(BaseCrawler):
                 
                 # 验证返回的是JSON且有数据
                 try:
-                    json_data = response.json()
+                    text = response.text
+                    json_data = json.loads(text)
                     if json_data.get('result') is True:
-                        # 添加请求延迟
-                        delay = self.request_delay + random.uniform(0, 2)
-                        self.logger.debug(f"请求成功，等待 {delay:.1f} 秒")
-                        import time
-                        time.sleep(delay)
-                        return response.text
+                        # 请求间隔由 crawl() 统一控制，这里不再额外等待
+                        # 已解析的结果留给parse复用，避免再次解析同一响应
+                        self._hebei_json_cache = (text, json_data)
+                        return text
                     else:
                         self.logger.warning(f"API返回结果为false: {api_url}")
                 except json.JSONDecodeError:
@@ -127,7 +177,6 @@ class CustomCrawler(BaseCrawler):
             if attempt < self.max_retries - 1:
                 wait_time = (2 ** (attempt + 1)) + random.uniform(0, 1)
                 self.logger.info(f"等待 {wait_time:.1f} 秒后重试...")
-                import time
                 time.sleep(wait_time)
         
         # API失败，回退到普通HTML获取方式
@@ -136,45 +185,19 @@ class CustomCrawler(BaseCrawler):
     
     def _fetch_hebei_zbpro(self) -> str:
         """获取招标计划公告数据 - 需要使用Selenium模拟点击"""
-        # 尝试导入Selenium
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from webdriver_manager.chrome import ChromeDriverManager
-            import time
-        except ImportError as e:
-            self.logger.warning(f"Selenium未安装: {e}，回退到普通方式")
+        if not SELENIUM_AVAILABLE:
+            self.logger.warning(f"Selenium未安装: {IMPORT_ERROR_MSG}，回退到普通方式")
             return super().fetch(self.url, None)
         
         self.logger.info(f"使用Selenium点击获取招标计划公告数据")
         
-        driver = None
+        # 从共享浏览器池借用浏览器，避免每次调用都重新启动Chrome
+        driver = SharedBrowserManager.acquire(self.timeout)
+        if not driver:
+            self.logger.error("初始化Chrome失败")
+            return super().fetch(self.url, None)
+        
         try:
-            # 配置Chrome选项
-            options = Options()
-            options.add_argument('--headless=new')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
-            # 初始化浏览器
-            try:
-                driver = webdriver.Chrome(options=options)
-            except:
-                try:
-                    service = Service(ChromeDriverManager().install())
-                    driver = webdriver.Chrome(service=service, options=options)
-                except Exception as e2:
-                    self.logger.error(f"初始化Chrome失败: {e2}")
-                    return super().fetch(self.url, None)
-            
             # 访问页面
             driver.get(self.url)
             time.sleep(3)  # 等待页面加载
@@ -204,14 +227,12 @@ class CustomCrawler(BaseCrawler):
             
         except Exception as e:
             self.logger.error(f"Selenium获取招标计划公告失败: {e}")
-            return super().fetch(self.url, None)
-        
         finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+            SharedBrowserManager.release(driver)
+        
+        # 浏览器归还后再回退到普通方式
+        return super().fetch(self.url, None)
+        
     def parse(self, html: str) -> List[BidInfo]:
         # 如果是河北省招标网的招标计划公告，使用专门的解析方法
         if self._is_hebei_api and self._hebei_api_endpoint == 'zbpro.do':
@@ -220,7 +241,7 @@ class CustomCrawler(BaseCrawler):
         # 如果是河北省招标网，检测是JSON还是HTML
         if self._is_hebei_api:
             # 检查是否是JSON响应（API成功）还是HTML（API失败回退）
-            if html and html.strip().startswith('{'):
+            if html and _JSON_OBJECT_START.match(html):
                 return self._parse_hebei_json(html)
             else:
                 # API失败，回退到HTML解析
@@ -231,21 +252,13 @@ class CustomCrawler(BaseCrawler):
     
     def _parse_hebei_zbpro_html(self, html: str) -> List[BidInfo]:
         """专门解析招标计划公告的HTML页面"""
-        from bs4 import BeautifulSoup
-        from datetime import datetime
-        from urllib.parse import urlparse, parse_qs
-        
-        soup = BeautifulSoup(html, 'lxml')
         bids = []
         today = datetime.now().strftime('%Y-%m-%d')
         
         # 查找所有详情链接 - 招标计划公告的链接包含 /infogk/detail.do
         seen_urls = set()
         
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            text = a.get_text(strip=True)
-            
+        for href, text in self.iter_links(html):
             # 只提取招标计划公告的详情链接
             if '/infogk/detail.do' not in href:
                 continue
@@ -257,7 +270,7 @@ class CustomCrawler(BaseCrawler):
             # 过滤无效标题
             if not text or len(text) < 4:
                 continue
-            if href.lower().startswith(('javascript:', '#', 'mailto:', 'tel:')):
+            if NON_PAGE_HREF.match(href):
                 continue
             
             # 补全URL，确保包含正确的categoryid
@@ -293,31 +306,26 @@ class CustomCrawler(BaseCrawler):
         bids = []
         
         try:
-            data = json.loads(json_str)
+            cached, self._hebei_json_cache = self._hebei_json_cache, None
+            if cached is not None and cached[0] is json_str:
+                data = cached[1]
+            else:
+                data = json.loads(json_str)
             # 根据API端点确定数据键名
-            endpoint_to_key = {
-                'zbgg.do': 'search_ZbGg',
-                'bggg.do': 'search_BgGg',
-                'dygs.do': 'search_DyGs',
-                'kbjl.do': 'search_KbJl',
-                'pbgs.do': 'search_PbGs',
-                'zhongbgg.do': 'search_ZhongbGg',
-                'qylx.do': 'search_QyLx',
-                'zbpro.do': 'search_ZbPro',
-            }
-            key = endpoint_to_key.get(self._hebei_api_endpoint, 'search_ZbGg')
+            key = _HEBEI_ENDPOINT_TO_KEY.get(self._hebei_api_endpoint, 'search_ZbGg')
             items = data.get('t', {}).get(key, [])
             
             base_detail_url = 'https://szj.hebei.gov.cn/zbtbfwpt/infogk/detail.do'
+            today = date.today().isoformat()
             
             for item in items:
                 # 解析发布时间
                 publish_time = item.get('bulletinissuetime')
                 if publish_time:
-                    # 时间戳转换为日期字符串
-                    publish_date = datetime.fromtimestamp(publish_time / 1000).strftime('%Y-%m-%d')
+                    # 毫秒时间戳直接转为日期，isoformat 不经过 strftime 的格式化
+                    publish_date = date.fromtimestamp(publish_time / 1000).isoformat()
                 else:
-                    publish_date = datetime.now().strftime('%Y-%m-%d')
+                    publish_date = today
                 
                 # 构造详情页URL
                 infoid = item.get('tenderbulletincode', '')
@@ -350,21 +358,18 @@ class CustomCrawler(BaseCrawler):
             return self._parse_ccgp_hebei_yx(html)
         
         # 通用HTML解析
-        soup = self.parse_html(html)
         bids = []
         today = datetime.now().strftime('%Y-%m-%d')
         
         # 提取所有链接
         seen_urls = set()
         
-        for a in soup.find_all('a', href=True):
-            text = a.get_text(strip=True)
-            href = a['href']
+        for href, text in self.iter_links(html):
             
             # 简单过滤无效链接
             if not text or len(text) < 4: # 标题太短通常不是招标信息
                 continue
-            if href.lower().startswith(('javascript:', '#', 'mailto:', 'tel:')):
+            if NON_PAGE_HREF.match(href):
                 continue
                 
             # 补全URL
@@ -388,12 +393,6 @@ class CustomCrawler(BaseCrawler):
     
     def _parse_ccgp_hebei_yx(self, html: str) -> List[BidInfo]:
         """解析河北政府采购意向公告 - 使用Selenium访问详情页获取具体项目"""
-        from bs4 import BeautifulSoup
-        from datetime import datetime
-        from urllib.parse import urljoin
-        import re
-        import time
-        
         soup = BeautifulSoup(html, 'lxml')
         bids = []
         
@@ -425,16 +424,8 @@ class CustomCrawler(BaseCrawler):
         self.logger.info(f"找到 {len(detail_urls)} 个意向公告，使用Selenium访问详情页获取具体项目...")
         
         # 尝试使用Selenium获取详情页数据
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from webdriver_manager.chrome import ChromeDriverManager
-        except ImportError as e:
-            self.logger.warning(f"Selenium未安装，回退到简单解析: {e}")
+        if not SELENIUM_AVAILABLE:
+            self.logger.warning(f"Selenium未安装，回退到简单解析: {IMPORT_ERROR_MSG}")
             return self._parse_ccgp_hebei_yx_simple(html)
         
         # 配置浏览器
@@ -558,11 +549,6 @@ class CustomCrawler(BaseCrawler):
     
     def _parse_ccgp_hebei_yx_simple(self, html: str) -> List[BidInfo]:
         """简单的意向公告解析 - 直接解析列表页"""
-        from bs4 import BeautifulSoup
-        from datetime import datetime
-        from urllib.parse import urljoin
-        import re
-        
         soup = BeautifulSoup(html, 'lxml')
         bids = []
         today = datetime.now().strftime('%Y-%m-%d')
@@ -999,9 +985,6 @@ class CustomCrawler(BaseCrawler):
     
     def crawl(self, stop_event=None):
         """重写crawl方法，绕过zbpro的anti-crawler检测"""
-        from typing import List
-        import time
-        
         # Check stop signal
         if stop_event and stop_event.is_set():
             self.logger.info(f"[{self.name}] 检测到停止信号，跳过爬取")
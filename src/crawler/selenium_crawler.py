@@ -1,8 +1,11 @@
 """
 Selenium浏览器爬虫 - 使用真实浏览器绕过反爬虫机制
 """
+import atexit
+import threading
 import time
 import logging
+from contextlib import contextmanager
 from typing import List, Optional
 from datetime import datetime
 from urllib.parse import urljoin
@@ -24,7 +27,7 @@ except Exception as e:
     SELENIUM_AVAILABLE = False
     IMPORT_ERROR_MSG = f"Unexpected error: {str(e)}"
 
-from .base import BidInfo
+from .base import BidInfo, NON_PAGE_HREF
 
 
 class SeleniumCrawler:
@@ -46,6 +49,7 @@ class SeleniumCrawler:
         self.headless = headless
         self.timeout = config.get('timeout', 30)
         self.logger = logging.getLogger(f"crawler.selenium.{name}")
+        # 独立浏览器，仅在共享浏览器池不可用时创建
         self.driver = None
         
     @property
@@ -119,29 +123,37 @@ class SeleniumCrawler:
     
     def fetch(self, url: str) -> Optional[str]:
         """使用浏览器获取页面内容"""
-        # 优先使用共享浏览器以节省资源
-        if not self.driver:
-            self.driver = SharedBrowserManager.get_driver(self.timeout)
-            if not self.driver:
-                # 共享浏览器不可用时使用独立浏览器
-                self.driver = self._init_driver()
-            if not self.driver:
-                return None
+        # 已创建独立浏览器时直接使用
+        if self.driver:
+            return self._load_page(self.driver, url)
+        
+        # 优先从共享浏览器池借用，用完立即归还
+        with SharedBrowserManager.borrow(self.timeout) as driver:
+            if driver:
+                return self._load_page(driver, url)
         
+        # 共享浏览器不可用时使用独立浏览器
+        self.driver = self._init_driver()
+        if not self.driver:
+            return None
+        return self._load_page(self.driver, url)
+    
+    def _load_page(self, driver, url: str) -> Optional[str]:
+        """用指定浏览器打开页面并返回源码"""
         try:
             self.logger.info(f"[Selenium] 正在访问: {url}")
-            self.driver.get(url)
+            driver.get(url)
             
             # 等待页面加载
             time.sleep(3)
             
             # 等待body加载完成
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
             # 返回页面源码
-            return self.driver.page_source
+            return driver.page_source
             
         except Exception as e:
             self.logger.error(f"[Selenium] 访问失败: {url}, 错误: {e}")
@@ -182,7 +194,7 @@ class SeleniumCrawler:
             # 过滤无效链接
             if not text or len(text) < 4:
                 continue
-            if href.lower().startswith(('javascript:', '#', 'mailto:', 'tel:')):
+            if NON_PAGE_HREF.match(href):
                 continue
             
             # 补全URL
@@ -203,9 +215,8 @@ class SeleniumCrawler:
         return bids
     
     def close(self):
-        """关闭浏览器（使用共享浏览器时不立即关闭）"""
-        # 如果使用共享浏览器，不在这里关闭
-        if self.driver and not SharedBrowserManager._instance:
+        """关闭独立浏览器（共享浏览器由 SharedBrowserManager 统一关闭）"""
+        if self.driver:
             try:
                 self.driver.quit()
             except:
@@ -218,24 +229,73 @@ class SeleniumCrawler:
 
 
 class SharedBrowserManager:
-    """共享浏览器管理器 - 所有爬虫复用同一个Chrome实例"""
-    _instance = None
-    _driver = None
-    _lock = None
+    """
+    共享浏览器池 - 所有爬虫复用少量Chrome实例
+    
+    爬虫通过 acquire()/release() 借用浏览器，同时在用的浏览器数量受信号量限制，
+    用完归还的浏览器留在池中供后续爬虫复用，直到 close()。
+    """
+    _pool_size = 2
+    _semaphore = threading.BoundedSemaphore(_pool_size)
+    _lock = threading.Lock()
+    _idle = []       # 空闲的浏览器
+    _borrowed = {}   # 已借出的浏览器 -> (借出时占用的信号量, 借出时的池代数)
+    _generation = 0  # 每次 close() 加一，用于识别关闭前借出的浏览器
     
     @classmethod
-    def get_driver(cls, timeout: int = 30):
-        """获取共享的浏览器实例"""
-        import threading
-        
-        if cls._lock is None:
-            cls._lock = threading.Lock()
+    def configure(cls, pool_size: int):
+        """设置最多同时使用的浏览器数量 (有浏览器借出时不调整)"""
+        pool_size = max(1, int(pool_size))
+        with cls._lock:
+            if pool_size != cls._pool_size and not cls._borrowed:
+                cls._pool_size = pool_size
+                cls._semaphore = threading.BoundedSemaphore(pool_size)
+    
+    @classmethod
+    def acquire(cls, timeout: int = 30):
+        """
+        借用一个浏览器，池中浏览器都在使用时等待归还
         
+        Returns:
+            浏览器实例，创建失败返回 None (无需归还)
+        """
+        semaphore = cls._semaphore
+        semaphore.acquire()
+        with cls._lock:
+            driver = cls._idle.pop() if cls._idle else None
+        if driver is None:
+            driver = cls._create_driver(timeout)
+            if driver is None:
+                semaphore.release()
+                return None
+        with cls._lock:
+            cls._borrowed[driver] = (semaphore, cls._generation)
+        return driver
+    
+    @classmethod
+    def release(cls, driver):
+        """归还借用的浏览器"""
+        if driver is None:
+            return
         with cls._lock:
-            if cls._driver is None:
-                cls._driver = cls._create_driver(timeout)
-                cls._instance = True
-            return cls._driver
+            borrowed = cls._borrowed.pop(driver, None)
+            if borrowed is None:
+                return
+            semaphore, generation = borrowed
+            # close() 之前借出的浏览器已被关闭，不再放回池中
+            if generation == cls._generation:
+                cls._idle.append(driver)
+        semaphore.release()
+    
+    @classmethod
+    @contextmanager
+    def borrow(cls, timeout: int = 30):
+        """以 with 语句借用浏览器，退出时自动归还"""
+        driver = cls.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            cls.release(driver)
     
     @classmethod
     def _create_driver(cls, timeout: int):
@@ -294,11 +354,17 @@ class SharedBrowserManager:
     
     @classmethod
     def close(cls):
-        """关闭共享浏览器"""
-        if cls._driver:
+        """关闭池中所有浏览器"""
+        with cls._lock:
+            drivers = cls._idle + list(cls._borrowed)
+            cls._idle = []
+            cls._generation += 1
+        for driver in drivers:
             try:
-                cls._driver.quit()
+                driver.quit()
             except:
                 pass
-            cls._driver = None
-            cls._instance = None
+
+
+# 进程退出时关闭共享浏览器，避免残留Chrome进程
+atexit.register(SharedBrowserManager.close)
@@ -11,7 +11,7 @@ import os
 import threading
 from datetime import datetime
 from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -23,6 +23,9 @@ class BidInfo:
     source: str
     content: str = ""
     purchaser: str = ""
+    # 匹配用的规范化文本 (由 KeywordMatcher.normalize 生成，不参与构造和比较)
+    title_norm: str = field(default="", init=False, repr=False, compare=False)
+    content_norm: str = field(default="", init=False, repr=False, compare=False)
     
     @property
     def unique_id(self) -> str:
@@ -86,6 +89,9 @@ class Storage:
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_notified ON bids(notified)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_bids_created ON bids(created_at)
+            """)
             conn.commit()
     
     def exists(self, bid: BidInfo) -> bool:
@@ -98,6 +104,12 @@ class Storage:
         )
         return cursor.fetchone() is not None
     
+    def load_seen_keys(self) -> set:
+        """一次性读取全部已存在记录的 unique_id，供批量去重时在内存中判断"""
+        conn = self._get_connection()
+        cursor = conn.execute("SELECT unique_id FROM bids")
+        return {row[0] for row in cursor}
+    
     def save(self, bid: BidInfo, notified: bool = False) -> bool:
         """保存招标信息，返回是否成功（新记录为True，重复为False）"""
         if self.exists(bid):
@@ -121,6 +133,29 @@ class Storage:
         conn.commit()
         return True
     
+    def save_many(self, bids: List[BidInfo], notified: bool = False) -> int:
+        """批量保存招标信息，在同一个事务中写入，已存在的记录自动跳过
+        
+        Returns:
+            新写入的记录数
+        """
+        if not bids:
+            return 0
+        
+        conn = self._get_connection()
+        before = conn.total_changes
+        flag = 1 if notified else 0
+        with conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO bids (unique_id, title, url, publish_date, source, content, purchaser, notified)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (bid.unique_id, bid.title, bid.url, bid.publish_date,
+                 bid.source, bid.content, bid.purchaser, flag)
+                for bid in bids
+            ])
+        return conn.total_changes - before
+    
     def mark_notified(self, bids):
         """标记招标信息已发送通知
         
@@ -140,19 +175,16 @@ class Storage:
         elif isinstance(bids, list) and len(bids) > 0:
             if isinstance(bids[0], BidInfo):
                 # BidInfo列表
-                for bid in bids:
-                    cursor.execute(
-                        "UPDATE bids SET notified = 1 WHERE unique_id = ?",
-                        (bid.unique_id,)
-                    )
+                cursor.executemany(
+                    "UPDATE bids SET notified = 1 WHERE unique_id = ?",
+                    [(bid.unique_id,) for bid in bids]
+                )
             elif isinstance(bids[0], str):
                 # URL列表
-                for url in bids:
-                    unique_id = hashlib.md5(url.encode()).hexdigest()
-                    cursor.execute(
-                        "UPDATE bids SET notified = 1 WHERE unique_id = ?",
-                        (unique_id,)
-                    )
+                cursor.executemany(
+                    "UPDATE bids SET notified = 1 WHERE unique_id = ?",
+                    [(hashlib.md5(url.encode()).hexdigest(),) for url in bids]
+                )
         
         conn.commit()
     
@@ -3398,7 +3398,7 @@ class MonitorGUI:
             return
         try:
             notifier = WeChatNotifier(self.wechat_config)
-            if notifier.send(bids):
+            if notifier.send_batched(bids):
                 self.queue_log("✅ 微信通知已发送")
             else:
                 self.queue_log("❌ 微信通知发送失败")
@@ -3501,7 +3501,7 @@ class MonitorGUI:
         try:
             config = {'provider': 'pushplus', 'token': token}
             notifier = WeChatNotifier(config)
-            if notifier.send(bids):
+            if notifier.send_batched(bids):
                 self.queue_log(f"✅ 微信已发送: {contact['name']}")
             else:
                 self.queue_log(f"❌ 微信发送失败: {contact['name']}")
@@ -5,6 +5,18 @@ import re
 from typing import List, Optional
 from dataclasses import dataclass
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 
 @dataclass
 class MatchResult:
@@ -30,8 +42,60 @@ class KeywordMatcher:
         self.include_keywords = [kw.lower() for kw in include_keywords]
         self.exclude_keywords = [kw.lower() for kw in (exclude_keywords or [])]
         self.must_contain_keywords = [kw.lower() for kw in (must_contain_keywords or [])]
+        all_keywords = self.include_keywords + self.exclude_keywords + self.must_contain_keywords
+        
+        # 供 is_match 使用的只读副本
+        self._include = tuple(self.include_keywords)
+        self._exclude = tuple(self.exclude_keywords)
+        self._must = tuple(self.must_contain_keywords)
+        self._include_set = frozenset(self._include)
+        self._exclude_set = frozenset(self._exclude)
+        self._must_set = frozenset(self._must)
+        
+        # 关键字中没有大小写字母 (如纯中文) 时，文本无需转小写即可直接匹配
+        self._fold_case = any(kw.upper() != kw for kw in all_keywords)
+        
+        # 三组关键字编入同一个 Aho-Corasick 自动机，一次扫描找出全部命中的关键字
+        self._automaton = self._build_automaton(all_keywords)
+        # 没有自动机时，先用一个正则判断文本中是否出现任一关键字，绝大多数不相关文本一次扫描即可排除
+        self._gate = self._build_gate(all_keywords) if self._automaton is None else None
+    
+    @staticmethod
+    def _build_automaton(keywords: List[str]):
+        """
+        构建关键字自动机
+        
+        未安装 pyahocorasick、没有关键字或存在空关键字 (自动机无法表示) 时返回 None，
+        此时回退到逐个关键字查找。
+        """
+        if not AHOCORASICK_AVAILABLE or not keywords or not all(keywords):
+            return None
+        automaton = ahocorasick.Automaton()
+        for kw in keywords:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _build_gate(keywords: List[str]):
+        """构建预筛正则，安装了 google-re2 时使用 RE2 (DFA 实现，不会回溯)"""
+        if not keywords:
+            return None
+        pattern = "|".join(re.escape(kw) for kw in keywords)
+        if RE2_AVAILABLE:
+            try:
+                return re2.compile(pattern)
+            except Exception:
+                pass
+        return re.compile(pattern)
+    
+    def normalize(self, text: Optional[str]) -> str:
+        """将文本规范化为匹配用的形式，结果可传给 match/match_any (normalized=True)"""
+        if not text:
+            return ""
+        return text.lower() if self._fold_case else text
     
-    def match(self, text: str) -> MatchResult:
+    def match(self, text: str, normalized: bool = False) -> MatchResult:
         """
         检查文本是否匹配
         
@@ -42,6 +106,7 @@ class KeywordMatcher:
         
         Args:
             text: 待匹配文本
+            normalized: 文本是否已经过 normalize 处理
             
         Returns:
             MatchResult 对象
@@ -49,7 +114,14 @@ class KeywordMatcher:
         if not text:
             return MatchResult(matched=False, matched_keywords=[])
         
-        text_lower = text.lower()
+        text_lower = text if normalized else self.normalize(text)
+        
+        if self._automaton is not None:
+            return self._match_hits({kw for _, kw in self._automaton.iter(text_lower)})
+        
+        # 未出现任何关键字: 既不会被排除也不会匹配
+        if self._gate is not None and not self._gate.search(text_lower):
+            return MatchResult(matched=False, matched_keywords=[])
         
         # 1. 检查排除关键字
         for kw in self.exclude_keywords:
@@ -87,12 +159,36 @@ class KeywordMatcher:
             matched_keywords=matched_keywords
         )
     
-    def match_any(self, *texts: str) -> MatchResult:
+    def _match_hits(self, hits: set) -> MatchResult:
+        """根据自动机命中的关键字集合判定，判定顺序和结果与逐个查找一致"""
+        # 1. 检查排除关键字
+        for kw in self.exclude_keywords:
+            if kw in hits:
+                return MatchResult(matched=False, matched_keywords=[], excluded_by=kw)
+        
+        # 2. 检查必须包含关键字（AND组）
+        must_matched = [kw for kw in self.must_contain_keywords if kw in hits]
+        if self.must_contain_keywords and not must_matched:
+            return MatchResult(matched=False, matched_keywords=[])
+        
+        # 3. 检查包含关键字（OR组），并加入匹配到的must_contain关键字
+        matched_keywords = [kw for kw in self.include_keywords if kw in hits]
+        for kw in must_matched:
+            if kw not in matched_keywords:
+                matched_keywords.append(kw)
+        
+        return MatchResult(
+            matched=len(matched_keywords) > 0,
+            matched_keywords=matched_keywords
+        )
+    
+    def match_any(self, *texts: str, normalized: bool = False) -> MatchResult:
         """
         检查多个文本，只要有一个匹配即可
         
         Args:
             texts: 多个待匹配文本
+            normalized: 文本是否已经过 normalize 处理
             
         Returns:
             MatchResult 对象
@@ -101,7 +197,7 @@ class KeywordMatcher:
         excluded_by = None
         
         for text in texts:
-            result = self.match(text)
+            result = self.match(text, normalized)
             if result.excluded_by:
                 excluded_by = result.excluded_by
             all_matched_keywords.extend(result.matched_keywords)
@@ -123,6 +219,51 @@ class KeywordMatcher:
         )
 
 
+    def is_match(self, *texts: str, normalized: bool = False) -> bool:
+        """
+        只判断是否匹配，结果与 match_any(*texts).matched 相同
+        
+        不收集命中的关键字，命中即返回，适合只需要布尔结果的批量过滤。
+        
+        Args:
+            texts: 多个待匹配文本
+            normalized: 文本是否已经过 normalize 处理
+        """
+        if normalized:
+            texts = [t for t in texts if t]
+        else:
+            texts = [self.normalize(t) for t in texts if t]
+        if not texts:
+            return False
+        
+        if self._automaton is not None:
+            hits = set()
+            for text in texts:
+                hits.update(kw for _, kw in self._automaton.iter(text))
+            if not hits or not hits.isdisjoint(self._exclude_set):
+                return False
+            # 设置了must_contain时，命中的must_contain关键字本身即计入匹配结果
+            if self._must:
+                return not hits.isdisjoint(self._must_set)
+            return not hits.isdisjoint(self._include_set)
+        
+        gate = self._gate
+        if gate is not None and not any(gate.search(text) for text in texts):
+            return False
+        
+        for kw in self._exclude:
+            for text in texts:
+                if kw in text:
+                    return False
+        
+        keywords = self._must or self._include
+        for kw in keywords:
+            for text in texts:
+                if kw in text:
+                    return True
+        return False
+
+
 class RegexMatcher:
     """正则表达式匹配器（高级用法）"""
     
@@ -1,114 +1,195 @@
 """
 监控核心模块 - 整合爬虫、匹配、通知功能
 """
+import copy
+import importlib
+import json
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Mapping
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from .database.storage import Storage, BidInfo
-    from .matcher.keyword import KeywordMatcher
-    from .notifier.email import EmailNotifier
-    from .notifier.sms import SMSNotifier
+
+def _import(name: str):
+    """按当前运行方式导入子模块: 作为包导入时用包内路径，直接运行时用顶层路径"""
+    return importlib.import_module(f"{__package__}.{name}" if __package__ else name)
+
+
+_storage = _import('database.storage')
+Storage, BidInfo = _storage.Storage, _storage.BidInfo
+KeywordMatcher = _import('matcher.keyword').KeywordMatcher
+EmailNotifier = _import('notifier.email').EmailNotifier
+SMSNotifier = _import('notifier.sms').SMSNotifier
+
+
+class _LazyCrawlerRegistry(Mapping):
+    """爬虫注册表: 只记录爬虫所在模块，首次取用某个爬虫类时才导入"""
     
-    from .crawler.ccgp import CCGPCrawler
-    from .crawler.chinabidding import ChinaBiddingCrawler
-    from .crawler.ebnew import EbnewCrawler
-    from .crawler.plap import PLAPCrawler
-    from .crawler.ggzy import GGZYCrawler
-    from .crawler.bidcenter import BidcenterCrawler
-    from .crawler.qianlima import QianlimaCrawler
-    from .crawler.chinatender import ChinaTenderCrawler
-    from .crawler.solarbe import SolarbeCrawler
-    from .crawler.pvyuan import PvyuanCrawler
-    from .crawler.dlnyzb import DlnyzbCrawler
-    from .crawler.youuav import YouuavCrawler
-except ImportError:
-    from database.storage import Storage, BidInfo
-    from matcher.keyword import KeywordMatcher
-    from notifier.email import EmailNotifier
-    from notifier.sms import SMSNotifier
+    def __init__(self, specs: Dict[str, tuple]):
+        self._specs = specs
+        self._classes = {}
     
-    from crawler.ccgp import CCGPCrawler
-    from crawler.chinabidding import ChinaBiddingCrawler
-    from crawler.ebnew import EbnewCrawler
-    from crawler.plap import PLAPCrawler
-    from crawler.ggzy import GGZYCrawler
-    from crawler.bidcenter import BidcenterCrawler
-    from crawler.qianlima import QianlimaCrawler
-    from crawler.chinatender import ChinaTenderCrawler
-    from crawler.solarbe import SolarbeCrawler
-    from crawler.pvyuan import PvyuanCrawler
-    from crawler.dlnyzb import DlnyzbCrawler
-    from crawler.youuav import YouuavCrawler
+    def __getitem__(self, key):
+        cls = self._classes.get(key)
+        if cls is None:
+            module_name, class_name = self._specs[key]
+            cls = self._classes[key] = getattr(_import(module_name), class_name)
+        return cls
+    
+    def __contains__(self, key):
+        # 只判断是否注册，不触发导入
+        return key in self._specs
+    
+    def __iter__(self):
+        return iter(self._specs)
+    
+    def __len__(self):
+        return len(self._specs)
+
+
+# 爬虫注册表 (只读)
+_ALL_CRAWLERS = _LazyCrawlerRegistry(MappingProxyType({
+    'chinabidding': ('crawler.chinabidding', 'ChinaBiddingCrawler'),
+    'ccgp': ('crawler.ccgp', 'CCGPCrawler'),
+}))
+
+# 有专用爬虫的网站，加载默认网站时不再为其创建通用爬虫
+_SPECIALIZED_CRAWLER_KEYS = frozenset(_ALL_CRAWLERS)
+
+# 默认内置网站配置 (用于通用爬虫，只读)
+_DEFAULT_SITES = MappingProxyType({key: MappingProxyType(site) for key, site in {
+    'chinabidding': {'name': '中国采购与招标网', 'url': 'http://www.chinabidding.cn/'},
+    'dlzb': {'name': '中国电力招标网', 'url': 'http://www.dlzb.com/'},
+    'chinabiddingcc': {'name': '中国采购招标网', 'url': 'http://www.chinabidding.cc/'},
+    'gdtzb': {'name': '国电投招标网', 'url': 'http://www.gdtzb.com'},
+    'cpeinet': {'name': '中国电力设备信息网', 'url': 'http://www.cpeinet.com.cn/'},
+    'espic': {'name': '电能e招采', 'url': 'https://ebid.espic.com.cn/'},
+    'chng': {'name': '华能集团电子商务平台', 'url': 'http://ec.chng.com.cn/ecmall/'},
+    'powerchina': {'name': '中国电建采购电子商务平台', 'url': 'http://ec.powerchina.cn'},
+    'powerchina_bid': {'name': '中国电建采购招标数智化平台', 'url': 'https://bid.powerchina.cn/bidweb/'},
+    'powerchina_ec': {'name': '中国电建设备物资集中采购平台', 'url': 'https://ec.powerchina.cn/'},
+    'powerchina_scm': {'name': '中国电建供应链云服务平台', 'url': 'https://scm.powerchina.cn/'},
+    'powerchina_idx': {'name': '中国电建承包商管理系统', 'url': 'http://bid.powerchina.cn/index'},
+    'powerchina_nw': {'name': '中国电建西北勘测设计研究院', 'url': 'http://ec1.powerchina.cn'},
+    'ceec': {'name': '中国能建电子采购平台', 'url': 'https://ec.ceec.net.cn/'},
+    'chdtp': {'name': '中国华电电子商务平台', 'url': 'http://www.chdtp.com/'},
+    'chec_gys': {'name': '中国华电科工供应商填报系统', 'url': 'http://gys.chec.com.cn:90'},
+    'chinazbcg': {'name': '中国招投标信息网', 'url': 'http://www.chinazbcg.com'},
+    'cdt': {'name': '中国大唐电子商务平台', 'url': 'http://www.cdt-ec.com/'},
+    'ebidding': {'name': '国义招标', 'url': 'http://www.ebidding.com/portal/'},
+    'neep': {'name': '国家能源e购', 'url': 'https://www.neep.shop/'},
+    'ceic': {'name': '国家能源集团生态协作平台', 'url': 'https://cooperation.ceic.com/'},
+    'sgcc': {'name': '国家电网电子商务平台', 'url': 'https://ecp.sgcc.com.cn/'},
+    'cecep': {'name': '中国节能环保电子采购平台', 'url': 'http://www.ebidding.cecep.cn/'},
+    'gdg': {'name': '广州发展集团电子采购平台', 'url': 'https://eps.gdg.com.cn/'},
+    'crpower': {'name': '华润电力', 'url': 'https://b2b.crpower.com.cn'},
+    'crc': {'name': '华润集团守正电子招标采购平台', 'url': 'https://szecp.crc.com.cn/'},
+    'longi': {'name': '隆基股份SRM系统', 'url': 'https://srm.longi.com:6080'},
+    'cgnpc': {'name': '中广核电子商务平台', 'url': 'https://ecp.cgnpc.com.cn'},
+    'dongfang': {'name': '东方电气', 'url': 'http://nsrm.dongfang.com/'},
+    'zjycgzx': {'name': '浙江云采购中心', 'url': 'https://www.zjycgzx.com'},
+    'ctg': {'name': '中国三峡电子采购平台', 'url': 'https://eps.ctg.com.cn/'},
+    'sdicc': {'name': '国投集团电子采购平台', 'url': 'https://www.sdicc.com.cn/'},
+    'csg': {'name': '中国南方电网供应链服务平台', 'url': 'http://www.bidding.csg.cn/'},
+    'sgccetp': {'name': '国网电子商务平台电工交易专区', 'url': 'https://sgccetp.com.cn/'},
+    'powerbeijing': {'name': '北京京能电子商务平台', 'url': 'http://www.powerbeijing-ec.com'},
+    'ccccltd': {'name': '中交集团供应链管理系统', 'url': 'http://ec.ccccltd.cn/'},
+    'jchc': {'name': '江苏交通控股', 'url': 'https://zbcg.jchc.cn/portal'},
+    'minmetals': {'name': '中国五矿集团供应链管理平台', 'url': 'https://ec.minmetals.com.cn/'},
+    'sunwoda': {'name': '欣旺达SRM', 'url': 'https://srm.sunwoda.com/'},
+    'cnbm': {'name': '中国建材集团采购平台', 'url': 'https://c.cnbm.com.cn/'},
+    'hghn': {'name': '华光环能数字化采购管理平台', 'url': 'https://hgcg.hghngroup.com/'},
+    'xcmg': {'name': '徐工全球数字化供应链系统平台', 'url': 'http://xdsc.xcmg.com:8985/'},
+    'xinecai': {'name': '安天智采', 'url': 'http://www.xinecai.com'},
+    'ariba': {'name': '远景SAP系统', 'url': 'https://service.ariba.com/'},
+    'faw': {'name': '中国一汽电子招标采购交易平台', 'url': 'https://srm.etp.faw.cn/staging'},
+}.items()})
+
 
-# 爬虫注册表
 def get_all_crawlers():
     """获取所有爬虫类"""
-    return {
-        'chinabidding': ChinaBiddingCrawler,
-        'ccgp': CCGPCrawler,
-    }
+    return _ALL_CRAWLERS
 
-# 默认内置网站配置 (用于通用爬虫)
 def get_default_sites():
     """获取默认的内置网站列表"""
-    return {
-        'chinabidding': {'name': '中国采购与招标网', 'url': 'http://www.chinabidding.cn/'},
-        'dlzb': {'name': '中国电力招标网', 'url': 'http://www.dlzb.com/'},
-        'chinabiddingcc': {'name': '中国采购招标网', 'url': 'http://www.chinabidding.cc/'},
-        'gdtzb': {'name': '国电投招标网', 'url': 'http://www.gdtzb.com'},
-        'cpeinet': {'name': '中国电力设备信息网', 'url': 'http://www.cpeinet.com.cn/'},
-        'espic': {'name': '电能e招采', 'url': 'https://ebid.espic.com.cn/'},
-        'chng': {'name': '华能集团电子商务平台', 'url': 'http://ec.chng.com.cn/ecmall/'},
-        'powerchina': {'name': '中国电建采购电子商务平台', 'url': 'http://ec.powerchina.cn'},
-        'powerchina_bid': {'name': '中国电建采购招标数智化平台', 'url': 'https://bid.powerchina.cn/bidweb/'},
-        'powerchina_ec': {'name': '中国电建设备物资集中采购平台', 'url': 'https://ec.powerchina.cn/'},
-        'powerchina_scm': {'name': '中国电建供应链云服务平台', 'url': 'https://scm.powerchina.cn/'},
-        'powerchina_idx': {'name': '中国电建承包商管理系统', 'url': 'http://bid.powerchina.cn/index'},
-        'powerchina_nw': {'name': '中国电建西北勘测设计研究院', 'url': 'http://ec1.powerchina.cn'},
-        'ceec': {'name': '中国能建电子采购平台', 'url': 'https://ec.ceec.net.cn/'},
-        'chdtp': {'name': '中国华电电子商务平台', 'url': 'http://www.chdtp.com/'},
-        'chec_gys': {'name': '中国华电科工供应商填报系统', 'url': 'http://gys.chec.com.cn:90'},
-        'chinazbcg': {'name': '中国招投标信息网', 'url': 'http://www.chinazbcg.com'},
-        'cdt': {'name': '中国大唐电子商务平台', 'url': 'http://www.cdt-ec.com/'},
-        'ebidding': {'name': '国义招标', 'url': 'http://www.ebidding.com/portal/'},
-        'neep': {'name': '国家能源e购', 'url': 'https://www.neep.shop/'},
-        'ceic': {'name': '国家能源集团生态协作平台', 'url': 'https://cooperation.ceic.com/'},
-        'sgcc': {'name': '国家电网电子商务平台', 'url': 'https://ecp.sgcc.com.cn/'},
-        'cecep': {'name': '中国节能环保电子采购平台', 'url': 'http://www.ebidding.cecep.cn/'},
-        'gdg': {'name': '广州发展集团电子采购平台', 'url': 'https://eps.gdg.com.cn/'},
-        'crpower': {'name': '华润电力', 'url': 'https://b2b.crpower.com.cn'},
-        'crc': {'name': '华润集团守正电子招标采购平台', 'url': 'https://szecp.crc.com.cn/'},
-        'longi': {'name': '隆基股份SRM系统', 'url': 'https://srm.longi.com:6080'},
-        'cgnpc': {'name': '中广核电子商务平台', 'url': 'https://ecp.cgnpc.com.cn'},
-        'dongfang': {'name': '东方电气', 'url': 'http://nsrm.dongfang.com/'},
-        'zjycgzx': {'name': '浙江云采购中心', 'url': 'https://www.zjycgzx.com'},
-        'ctg': {'name': '中国三峡电子采购平台', 'url': 'https://eps.ctg.com.cn/'},
-        'sdicc': {'name': '国投集团电子采购平台', 'url': 'https://www.sdicc.com.cn/'},
-        'csg': {'name': '中国南方电网供应链服务平台', 'url': 'http://www.bidding.csg.cn/'},
-        'sgccetp': {'name': '国网电子商务平台电工交易专区', 'url': 'https://sgccetp.com.cn/'},
-        'powerbeijing': {'name': '北京京能电子商务平台', 'url': 'http://www.powerbeijing-ec.com'},
-        'ccccltd': {'name': '中交集团供应链管理系统', 'url': 'http://ec.ccccltd.cn/'},
-        'jchc': {'name': '江苏交通控股', 'url': 'https://zbcg.jchc.cn/portal'},
-        'minmetals': {'name': '中国五矿集团供应链管理平台', 'url': 'https://ec.minmetals.com.cn/'},
-        'sunwoda': {'name': '欣旺达SRM', 'url': 'https://srm.sunwoda.com/'},
-        'cnbm': {'name': '中国建材集团采购平台', 'url': 'https://c.cnbm.com.cn/'},
-        'hghn': {'name': '华光环能数字化采购管理平台', 'url': 'https://hgcg.hghngroup.com/'},
-        'xcmg': {'name': '徐工全球数字化供应链系统平台', 'url': 'http://xdsc.xcmg.com:8985/'},
-        'xinecai': {'name': '安天智采', 'url': 'http://www.xinecai.com'},
-        'ariba': {'name': '远景SAP系统', 'url': 'https://service.ariba.com/'},
-        'faw': {'name': '中国一汽电子招标采购交易平台', 'url': 'https://srm.etp.faw.cn/staging'},
-    }
+    return _DEFAULT_SITES
+
+
+@lru_cache(maxsize=8)
+def _load_config_file(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    读取并解析配置文件 (JSON 或 YAML)
+    
+    按 (路径, 修改时间) 缓存，反复创建 MonitorCore 时不再重复读盘和解析，
+    文件被修改后修改时间变化，自动重新读取。
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        import yaml
+        # 优先使用 libyaml 的 C 实现
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        return yaml.load(f, Loader=loader) or {}
+
+
+def _read_config(path: str) -> Dict[str, Any]:
+    """读取配置文件，返回副本 (调用方会修改配置，不能直接改动缓存)"""
+    path = os.path.abspath(path)
+    return copy.deepcopy(_load_config_file(path, os.path.getmtime(path)))
+
+
+# 日志队列: 爬取/匹配线程只负责入队，由后台线程统一写日志并调用界面回调。
+# GUI 每次检索都会新建 MonitorCore，因此队列和线程为模块级，全进程共用一个。
+_log_queue = queue.Queue(maxsize=10000)
+_log_thread = None
+_log_thread_lock = threading.Lock()
+
+
+def _emit_log(callback: Callable[[str], None], message: str):
+    """写日志并调用回调，回调异常不影响日志线程"""
+    logging.info(message)
+    try:
+        callback(message)
+    except Exception:
+        logging.exception("日志回调执行失败")
+
+
+def _log_worker():
+    """后台日志线程: 按入队顺序输出日志"""
+    while True:
+        callback, message = _log_queue.get()
+        try:
+            _emit_log(callback, message)
+        finally:
+            _log_queue.task_done()
+
+
+def _ensure_log_worker():
+    """首次记录日志时启动后台日志线程"""
+    global _log_thread
+    if _log_thread is None:
+        with _log_thread_lock:
+            if _log_thread is None:
+                thread = threading.Thread(target=_log_worker, name='monitor-log', daemon=True)
+                thread.start()
+                _log_thread = thread
 
 
 class MonitorCore:
     """监控核心类"""
     
+    # AI 相关性判断的最大并发请求数
+    AI_MAX_WORKERS = 8
+    
     def __init__(self, 
                  keywords: List[str],
                  exclude_keywords: List[str] = None,
@@ -198,19 +279,15 @@ class MonitorCore:
 
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件 - 优先从user_config.json加载"""
-        import yaml
-        import json
-        
         # 优先从user_config.json加载
         user_config_path = 'user_config.json'
         if os.path.exists(user_config_path):
             try:
-                with open(user_config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # 保存wps_config供后续使用
-                    if config.get('wps_config'):
-                        self._wps_config = config['wps_config']
-                    return config
+                config = _read_config(user_config_path)
+                # 保存wps_config供后续使用
+                if config.get('wps_config'):
+                    self._wps_config = config['wps_config']
+                return config
             except Exception as e:
                 print(f"加载user_config.json失败: {e}")
         config_paths = [
@@ -221,8 +298,7 @@ class MonitorCore:
         
         for path in config_paths:
             if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f) or {}
+                return _read_config(path)
         
         return {}
     
@@ -264,10 +340,13 @@ class MonitorCore:
                 use_selenium = False
         
         from crawler.custom import CustomCrawler
+        from crawler.selenium_crawler import SharedBrowserManager
+        # 需要浏览器的爬虫从共享浏览器池借用，限制同时打开的浏览器数量
+        SharedBrowserManager.configure(crawler_config.get('browser_pool_size', 2))
         default_sites = get_default_sites()
         
         for key in enabled:
-            if key in default_sites and key not in crawler_classes:
+            if key in default_sites and key not in _SPECIALIZED_CRAWLER_KEYS:
                 site = default_sites[key]
                 try:
                     if use_selenium:
@@ -297,19 +376,30 @@ class MonitorCore:
             except Exception as e:
                 self.log(f"[WARN] Failed to load custom crawler {site.get('name')}: {e}")
         
+        # 加载结果先于调用方后续的日志输出
+        self.flush_log()
         return crawlers
     
     def log(self, message: str):
-        """记录日志"""
-        logging.info(message)
-        self.log_callback(message)
+        """记录日志 (放入日志队列，由后台线程输出)"""
+        _ensure_log_worker()
+        try:
+            _log_queue.put_nowait((self.log_callback, message))
+        except queue.Full:
+            # 队列积压时直接输出，不丢日志
+            _emit_log(self.log_callback, message)
+    
+    def flush_log(self):
+        """等待已入队的日志全部输出"""
+        if _log_thread is not None:
+            _log_queue.join()
     
     def run_once(self, progress_callback=None, stop_event=None) -> Dict[str, Any]:
         """
         执行一次监控
         
         Args:
-            progress_callback: 进度回调函数 (current, total, site_name)
+            progress_callback: 进度回调函数 (已完成数, total, site_name)
             stop_event: 停止事件，用于中断爬取
         
         Returns:
@@ -321,6 +411,10 @@ class MonitorCore:
         all_matched_bids = []
         failed_sites = []
         total_crawlers = len(self.crawlers)
+        check_stop = stop_event.is_set if stop_event else (lambda: False)
+        
+        # 已入库记录的 unique_id，本次运行内在内存中去重，避免逐条查询数据库
+        seen_keys = self.storage.load_seen_keys()
         
         # AI 过滤统计
         ai_stats = {
@@ -329,54 +423,91 @@ class MonitorCore:
             'ai_rejected': [],      # AI 判定不相关的项目 (title, url, reason)
         }
         
-        for idx, crawler in enumerate(self.crawlers, 1):
-            # 检查停止信号
-            if stop_event and stop_event.is_set():
-                self.log("检测到停止信号，中断爬取")
-                break
-            
-            # 调用进度回调
-            if progress_callback:
-                progress_callback(idx, total_crawlers, crawler.name)
+        # 各网站的抓取互不依赖且以网络等待为主，放入线程池并发执行；
+        # 匹配、AI过滤和入库仍在当前线程按完成顺序逐个处理
+        crawler_config = self.config.get('crawler', {})
+        max_workers = max(1, int(crawler_config.get('max_workers', 8)))
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawler') as executor:
+            futures = {
+                executor.submit(self._crawl_site, crawler, stop_event): crawler
+                for crawler in self.crawlers
+            }
             
-            try:
-                self.log(f"Crawling: {crawler.name}...")
-                bids = crawler.crawl(stop_event=stop_event)
+            for idx, future in enumerate(as_completed(futures), 1):
+                crawler = futures[future]
                 
-                # 爬取后再次检查停止信号
-                if stop_event and stop_event.is_set():
-                    self.log("检测到停止信号，中断处理")
-                    break
+                # 调用进度回调
+                if progress_callback:
+                    progress_callback(idx, total_crawlers, crawler.name)
                 
-                if bids is None:
-                    # 爬取失败
-                    failed_sites.append({
-                        'name': crawler.name,
-                        'error': 'Failed to fetch data (possibly blocked)'
-                    })
-                    self.log(f"[FAILED] {crawler.name}: Website may be blocking requests!")
-                    continue
-                
-                # 匹配关键字
-                matched_count = 0
-                for bid in bids:
-                    # 在匹配过程中也检查停止信号
-                    if stop_event and stop_event.is_set():
-                        self.log("检测到停止信号，中断匹配")
-                        break
+                try:
+                    bids = future.result()
                     
-                    result = self.matcher.match_any(bid.title, bid.content)
+                    # 爬取后再次检查停止信号
+                    if check_stop():
+                        self.log("检测到停止信号，中断处理")
+                        for pending in futures:
+                            pending.cancel()
+                        break
                     
-                    if result.matched:
-                        # 记录关键词匹配的项目
-                        ai_stats['keyword_matched'].append({
-                            'title': bid.title,
-                            'url': bid.url
+                    if bids is None:
+                        # 爬取失败
+                        failed_sites.append({
+                            'name': crawler.name,
+                            'error': 'Failed to fetch data (possibly blocked)'
                         })
+                        self.log(f"[FAILED] {crawler.name}: Website may be blocking requests!")
+                        continue
+                    
+                    if not bids:
+                        # 没有抓到任何条目，无需匹配和入库
+                        self.log(f"[OK] {crawler.name}: No items found")
+                        continue
+                    
+                    # 1. 匹配关键字 (文本只规范化一次，保存在 BidInfo 上供后续复用)
+                    normalize = self.matcher.normalize
+                    keyword_matched = []
+                    for i, bid in enumerate(bids):
+                        # 在匹配过程中也检查停止信号 (每64条检查一次)
+                        if (i & 63) == 0 and check_stop():
+                            self.log("检测到停止信号，中断匹配")
+                            break
+                        
+                        bid.title_norm = normalize(bid.title)
+                        bid.content_norm = normalize(bid.content)
+                        if self.matcher.is_match(bid.title_norm, bid.content_norm, normalized=True):
+                            # 记录关键词匹配的项目
+                            ai_stats['keyword_matched'].append({
+                                'title': bid.title,
+                                'url': bid.url
+                            })
+                            keyword_matched.append(bid)
+                    
+                    # 2. 去重 (已入库或本批重复的项目不再做AI判断)
+                    candidates = []
+                    batch_keys = set()
+                    for bid in keyword_matched:
+                        unique_id = bid.unique_id
+                        if unique_id not in seen_keys and unique_id not in batch_keys:
+                            batch_keys.add(unique_id)
+                            candidates.append(bid)
+                    
+                    # 3. AI 二次过滤 (如果启用)，多条请求并发进行
+                    if self.ai_guard:
+                        verdicts = self._check_relevance_many(candidates, stop_event)
+                    else:
+                        verdicts = [(True, None)] * len(candidates)
+                    
+                    # 4. 入库 (本网站的新项目在一个事务中批量写入)
+                    new_bids = []
+                    for bid, verdict in zip(candidates, verdicts):
+                        if verdict is None:
+                            # 收到停止信号，未完成AI判断
+                            continue
                         
-                        # AI 二次过滤 (如果启用)
                         if self.ai_guard:
-                            ai_relevant, ai_reason = self.ai_guard.check_relevance(bid.title, bid.content or "")
+                            ai_relevant, ai_reason = verdict
                             if not ai_relevant:
                                 ai_stats['ai_rejected'].append({
                                     'title': bid.title,
@@ -392,16 +523,18 @@ class MonitorCore:
                                     'reason': ai_reason
                                 })
                         
-                        if not self.storage.exists(bid):
-                            self.storage.save(bid, notified=False)
-                            all_matched_bids.append(bid)
-                            matched_count += 1
-                
-                self.log(f"[OK] {crawler.name}: Found {len(bids)} items, {matched_count} new matches")
-                
-            except Exception as e:
-                failed_sites.append({'name': crawler.name, 'error': str(e)})
-                self.log(f"[ERROR] {crawler.name}: {e}")
+                        seen_keys.add(bid.unique_id)
+                        new_bids.append(bid)
+                    
+                    self.storage.save_many(new_bids, notified=False)
+                    all_matched_bids.extend(new_bids)
+                    matched_count = len(new_bids)
+                    
+                    self.log(f"[OK] {crawler.name}: Found {len(bids)} items, {matched_count} new matches")
+                    
+                except Exception as e:
+                    failed_sites.append({'name': crawler.name, 'error': str(e)})
+                    self.log(f"[ERROR] {crawler.name}: {e}")
         
         # 发送通知
         if all_matched_bids:
@@ -457,6 +590,9 @@ class MonitorCore:
         except:
             pass
         
+        # 确保本次运行的日志在返回前全部输出
+        self.flush_log()
+        
         return {
             'new_count': len(all_matched_bids),
             'failed_sites': failed_sites,
@@ -464,6 +600,33 @@ class MonitorCore:
             'ai_stats': ai_stats
         }
     
+    def _check_relevance_many(self, bids: List[BidInfo], stop_event=None) -> List[Optional[tuple]]:
+        """
+        并发调用 AI 判断多条项目的相关性
+        
+        Returns:
+            与 bids 顺序一致的 (is_relevant, reason) 列表，收到停止信号后未判断的项为 None
+        """
+        def check(bid):
+            if stop_event and stop_event.is_set():
+                return None
+            return self.ai_guard.check_relevance(bid.title, bid.content or "")
+        
+        if len(bids) <= 1:
+            return [check(bid) for bid in bids]
+        
+        # 并发数有上限，避免触发模型服务的频率限制
+        with ThreadPoolExecutor(max_workers=min(self.AI_MAX_WORKERS, len(bids)),
+                                thread_name_prefix='ai_guard') as executor:
+            return list(executor.map(check, bids))
+    
+    def _crawl_site(self, crawler, stop_event=None) -> Optional[List[BidInfo]]:
+        """在工作线程中爬取单个网站，收到停止信号时直接跳过"""
+        if stop_event and stop_event.is_set():
+            return []
+        self.log(f"Crawling: {crawler.name}...")
+        return crawler.crawl(stop_event=stop_event)
+    
     def _send_notifications(self, bids: List[BidInfo]):
         """发送通知"""
         success = False
@@ -507,5 +670,4 @@ class MonitorCore:
                 self.log(f"[ERROR] SMS failed: {e}")
         
         if success:
-            for bid in bids:
-                self.storage.mark_notified(bid)
+            self.storage.mark_notified(bids)
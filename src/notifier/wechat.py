@@ -4,9 +4,57 @@
 1. PushPlus (个人微信)
 2. 企业微信 Webhook (企业微信群)
 """
+import atexit
 import requests
 import json
 import logging
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# PushPlus 和企业微信请求共用的会话，连续推送时复用已建立的 TCP/TLS 连接
+_session = None
+_session_lock = threading.Lock()
+_JSON_HEADERS = {'Content-Type': 'application/json; charset=utf-8'}
+
+# 企业微信 Markdown 消息内容上限 (UTF-8 字节)
+MARKDOWN_MAX_BYTES = 4096
+
+
+def _get_session() -> requests.Session:
+    """获取通知模块共用的会话"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # 只重试连接类错误 (POST 不在默认可重试方法中，不会因读超时重复推送)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                  max_retries=Retry(total=2, backoff_factor=0.3))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _post_json(url: str, data: dict) -> dict:
+    """
+    以 JSON 发送 POST 请求并解析响应
+    
+    中文内容直接按 UTF-8 编码发送，不转义为 \\uXXXX，请求体更小、编码更快。
+    """
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    response = _get_session().post(url, data=body, headers=_JSON_HEADERS, timeout=10)
+    return json.loads(response.content)
+
+
+def close_session():
+    """关闭共用会话，释放连接池 (之后再次推送时会重新创建)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
 
 
 class PushPlusNotifier:
@@ -24,6 +72,7 @@ class PushPlusNotifier:
         """
         self.token = token
         self.topic = topic
+    
     def send(self, title: str, content: str, template: str = "html") -> bool:
         """
         发送消息
@@ -45,8 +94,7 @@ class PushPlusNotifier:
             }
             if self.topic:
                 data['topic'] = self.topic
-            response = requests.post(self.API_URL, json=data, timeout=10)
-            result = response.json()
+            result = _post_json(self.API_URL, data)
             
             code = result.get("code")
             msg = result.get("msg", "未知错误")
@@ -100,8 +148,7 @@ class EnterpriseWeChatNotifier:
             if mentioned_list:
                 data["text"]["mentioned_mobile_list"] = mentioned_list
             
-            response = requests.post(self.webhook_url, json=data, timeout=10)
-            result = response.json()
+            result = _post_json(self.webhook_url, data)
             
             if result.get("errcode") == 0:
                 logging.info("[企业微信] 发送成功")
@@ -130,8 +177,7 @@ class EnterpriseWeChatNotifier:
                     "content": content
                 }
             }
-            response = requests.post(self.webhook_url, json=data, timeout=10)
-            result = response.json()
+            result = _post_json(self.webhook_url, data)
             
             if result.get("errcode") == 0:
                 logging.info("[企业微信] Markdown 发送成功")
@@ -156,10 +202,14 @@ class WeChatNotifier:
                 'provider': 'pushplus' | 'enterprise',
                 'token': str (PushPlus token),
                 'topic': str (PushPlus 群组编码，实现一对多推送),
-                'webhook_url': str (企业微信 Webhook)
+                'webhook_url': str (企业微信 Webhook),
+                'batch_size': int (分批发送时每条消息的项目数，默认20),
+                'max_batches': int (分批发送时单次最多推送的消息数，默认3)
             }
         """
         self.provider = config.get('provider', 'pushplus')
+        self.batch_size = max(1, int(config.get('batch_size') or 20))
+        self.max_batches = max(1, int(config.get('max_batches') or 3))
         
         if self.provider == 'pushplus':
             self.client = PushPlusNotifier(
@@ -185,47 +235,148 @@ class WeChatNotifier:
         
         # 自动生成摘要
         if summary is None:
-            sources = list(set([b.source for b in bids]))
-            source_str = "、".join(sources)
-            if len(source_str) > 20:
-                source_str = source_str[:18] + "..."
-            summary = {
-                'count': len(bids),
-                'source': source_str
-            }
+            summary = self._make_summary(bids)
+        
+        # PushPlus 最多显示10条，企业微信最多显示5条
+        limit = 10 if self.provider == 'pushplus' else 5
+        return self._send_message(bids, summary, limit)
+    
+    def send_batched(self, bids: list, batch_size: int = None, max_batches: int = None) -> bool:
+        """
+        分批发送招标信息，每批合并为一条消息
         
-        # 构建消息
-        title = f"🔔 招标监控 - {summary['count']}条新信息"
+        单次最多推送 max_batches 条消息，避免触发频率限制和每日额度，
+        超出部分在最后一条消息中以"还有 N 条"提示。
+        
+        Args:
+            bids: 招标信息列表
+            batch_size: 每条消息包含的项目数 (默认使用配置中的 batch_size)
+            max_batches: 最多推送的消息数 (默认使用配置中的 max_batches)
+        
+        Returns:
+            是否全部发送成功
+        """
+        if not bids:
+            return False
+        
+        batch_size = batch_size or self.batch_size
+        max_batches = max_batches or self.max_batches
+        summary = self._make_summary(bids)
+        
+        if self.provider == 'pushplus':
+            sizes = [len(bids[i:i + batch_size]) for i in range(0, len(bids), batch_size)]
+        else:
+            sizes = self._split_markdown(bids, summary, batch_size)
+        sizes = sizes[:max_batches]
+        total = len(sizes)
+        
+        start = 0
+        for n, size in enumerate(sizes, 1):
+            # 最后一批带上剩余项目，由 _send_message 生成"还有 N 条"提示
+            batch = bids[start:] if n == total else bids[start:start + size]
+            part = f" ({n}/{total})" if total > 1 else ""
+            if not self._send_message(batch, summary, size, part):
+                logging.error(f"[微信] 第 {n}/{total} 批发送失败，停止后续发送")
+                return False
+            start += size
+        
+        return True
+    
+    def _split_markdown(self, bids: list, summary: dict, batch_size: int) -> list:
+        """
+        按渲染后的 UTF-8 字节数划分企业微信消息批次
+        
+        Returns:
+            每批的项目数列表
+        """
+        # 头部按最长的批次标记估算，并为末尾的"还有 N 条"提示预留空间
+        reserved = len(self._markdown_header(summary, " (999/999)").encode('utf-8'))
+        reserved += len(self._markdown_more(len(bids)).encode('utf-8'))
+        budget = MARKDOWN_MAX_BYTES - reserved
+        
+        sizes = []
+        count = used = 0
+        for bid in bids:
+            line_bytes = len(self._markdown_line(bid).encode('utf-8'))
+            if count and (count >= batch_size or used + line_bytes > budget):
+                sizes.append(count)
+                count = used = 0
+            count += 1
+            used += line_bytes
+        if count:
+            sizes.append(count)
+        return sizes
+    
+    @staticmethod
+    def _make_summary(bids: list) -> dict:
+        """根据招标信息生成摘要"""
+        sources = list(set([b.source for b in bids]))
+        source_str = "、".join(sources)
+        if len(source_str) > 20:
+            source_str = source_str[:18] + "..."
+        return {
+            'count': len(bids),
+            'source': source_str
+        }
+    
+    def _send_message(self, bids: list, summary: dict, limit: int, part: str = "") -> bool:
+        """
+        构建并发送一条消息
+        
+        Args:
+            bids: 本条消息涉及的招标信息
+            summary: 摘要信息
+            limit: 最多列出的项目数
+            part: 分批发送时的批次标记，如 " (1/3)"
+        """
+        title = f"🔔 招标监控 - {summary['count']}条新信息{part}"
         
         if self.provider == 'pushplus':
             # HTML 格式
-            content = f"""
-            <h3>招投标监控提醒</h3>
+            parts = [f"""
+            <h3>招投标监控提醒{part}</h3>
             <p>发现 <b>{summary['count']}</b> 条新信息</p>
             <p>来源: {summary['source']}</p>
             <hr>
             <ul>
-            """
-            for bid in bids[:10]:  # 最多显示10条
-                content += f"<li><a href='{bid.url}'>{bid.title}</a> - {bid.source}</li>"
-            if len(bids) > 10:
-                content += f"<li>... 还有 {len(bids) - 10} 条，详情请查看邮件</li>"
-            content += "</ul>"
+            """]
+            for bid in bids[:limit]:
+                parts.append(f"<li><a href='{bid.url}'>{bid.title}</a> - {bid.source}</li>")
+            if len(bids) > limit:
+                parts.append(f"<li>... 还有 {len(bids) - limit} 条，详情请查看邮件</li>")
+            parts.append("</ul>")
+            content = "".join(parts)
             
             return self.client.send(title, content, "html")
         else:
             # Markdown 格式
-            content = f"""## 🔔 招标监控提醒
+            parts = [self._markdown_header(summary, part)]
+            for bid in bids[:limit]:
+                parts.append(self._markdown_line(bid))
+            if len(bids) > limit:
+                parts.append(self._markdown_more(len(bids) - limit))
+            content = "".join(parts)
+            
+            return self.client.send_markdown(content)
+    
+    @staticmethod
+    def _markdown_header(summary: dict, part: str = "") -> str:
+        """企业微信 Markdown 消息头部"""
+        return f"""## 🔔 招标监控提醒{part}
 > 发现 **{summary['count']}** 条新信息
 > 来源: {summary['source']}
 
 """
-            for bid in bids[:5]:
-                content += f"- [{bid.title}]({bid.url})\n"
-            if len(bids) > 5:
-                content += f"\n... 还有 {len(bids) - 5} 条，详情请查看邮件"
-            
-            return self.client.send_markdown(content)
+    
+    @staticmethod
+    def _markdown_line(bid) -> str:
+        """企业微信 Markdown 消息中的单条项目"""
+        return f"- [{bid.title}]({bid.url})\n"
+    
+    @staticmethod
+    def _markdown_more(count: int) -> str:
+        """企业微信 Markdown 消息末尾的剩余数量提示"""
+        return f"\n... 还有 {count} 条，详情请查看邮件"
     
     def send_test(self) -> bool:
         """发送测试消息"""
@@ -237,3 +388,7 @@ class WeChatNotifier:
             )
         else:
             return self.client.send("✅ 企业微信通知测试成功！如果您看到这条消息，说明配置正确。")
+
+
+# 进程退出时释放连接池
+atexit.register(close_session)